@@ -1,323 +1,794 @@
-# PYTHON EVALUATOR BY AHMAD SAEED
-# Lexer
-from collections import namedtuple
-
-# Definition of token types
-Token = namedtuple('Token', ['type', 'value'])
-
-RESERVED_KEYWORDS = {'print'}
-
-def lexer(input_str):
-    """
-    Converts an input string into a list of tokens.
-
-    Args:
-        input_str (str): The input string to be tokenized.
-
-    Returns:
-        list: A list of Token namedtuples representing the tokens in the input string.
-    """
-    tokens = []
-    i = 0
-    while i < len(input_str):
-        char = input_str[i]
-        if char.isdigit():
-            # Recognize and extract numeric literals
-            num = ''
-            while i < len(input_str) and input_str[i].isdigit():
-                num += input_str[i]
-                i += 1
-            tokens.append(Token('NUMBER', int(num)))
-        elif char.isalpha():
-            # Recognize and extract identifiers (variable names)
-            identifier = ''
-            while i < len(input_str) and (input_str[i].isalpha() or input_str[i].isdigit()):
-                identifier += input_str[i]
-                i += 1
-            if identifier in RESERVED_KEYWORDS:
-                # If the identifier is a reserved keyword, add it as a token of that type
-                tokens.append(Token(identifier, identifier))
-            else:
-                # Otherwise, add it as an IDENTIFIER token
-                tokens.append(Token('IDENTIFIER', identifier))
-        elif char == '=':
-            # Recognize the assignment operator
-            tokens.append(Token('ASSIGN', '='))
-            i += 1
-        elif char in '+-*/()':
-            # Recognize and extract arithmetic operators and parentheses
-            tokens.append(Token(char, char))
-            i += 1
-        elif char.isspace():
-            # Skip whitespace characters
-            i += 1
-        else:
-            # Raise an error for invalid characters
-            raise ValueError(f"Invalid character: {char}")
-    return tokens
-
-# Parser
-class ASTNode:
-    """Base class for Abstract Syntax Tree (AST) nodes."""
-    pass
-
-class NumberNode(ASTNode):
-    """AST node representing a numeric literal."""
-    def __init__(self, token):
-        self.token = token
-
-class VariableNode(ASTNode):
-    """AST node representing a variable."""
-    def __init__(self, token):
-        self.token = token
-
-class AssignmentNode(ASTNode):
-    """AST node representing an assignment statement."""
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-class BinaryOpNode(ASTNode):
-    """AST node representing a binary operation."""
-    def __init__(self, left, op, right):
-        self.left = left
-        self.op = op
-        self.right = right
-
-class PrintNode(ASTNode):
-    """AST node representing a print statement."""
-    def __init__(self, expr):
-        self.expr = expr
-
-def parser(tokens):
-    """
-    Converts a list of tokens into an Abstract Syntax Tree (AST).
-
-    Args:
-        tokens (list): A list of Token namedtuples.
-
-    Returns:
-        list: A list of AST nodes representing the parsed program.
-    """
-    def parse_expr():
-        """Parse an expression."""
-        node = parse_term()
-        while tokens and tokens[0].type in '+-':
-            op = tokens.pop(0)
-            right = parse_term()
-            node = BinaryOpNode(node, op, right)
-        return node
-
-    def parse_term():
-        """Parse a term."""
-        node = parse_factor()
-        while tokens and tokens[0].type in '*//':
-            op = tokens.pop(0)
-            right = parse_factor()
-            node = BinaryOpNode(node, op, right)
-        return node
-
-    def parse_factor():
-        """Parse a factor."""
-        if not tokens:
-            raise ValueError("Unexpected end of input")
-        token = tokens.pop(0)
-        if token.type == 'NUMBER':
-            return NumberNode(token)
-        elif token.type == 'IDENTIFIER':
-            return VariableNode(token)
-        elif token.type == '(':
-            node = parse_expr()
-            if not tokens or tokens[0].type != ')':
-                raise ValueError("Expected ')'")
-            tokens.pop(0)
-            return node
-        elif token.type == 'print':
-            expr = parse_expr()
-            return PrintNode(expr)
-        else:
-            raise ValueError(f"Unexpected token: {token.type}")
-
-    def parse_assignment():
-        """Parse an assignment statement."""
-        left = parse_factor()
-        if not tokens or tokens[0].type != 'ASSIGN':
-            return left
-        tokens.pop(0)
-        right = parse_expr()
-        return AssignmentNode(left, right)
-
-    ast = []
-    while tokens:
-        ast.append(parse_assignment())
-    return ast
-
-# Evaluator
-class Interpreter:
-    """
-    Interpreter for the programming language.
-    """
-    def __init__(self):
-        self.variables = {}
-
-    def visit(self, node):
-        """
-        Dispatches the visit to the appropriate visitor method based on the type of the node.
-
-        Args:
-            node (ASTNode): The node to be visited.
-
-        Returns:
-            The result of visiting the node.
-        """
-        method_name = 'visit_' + type(node).__name__
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-
-    def visit_NumberNode(self, node):
-        """Visit a NumberNode and return its value."""
-        return node.token.value
-
-    def visit_VariableNode(self, node):
-        """Visit a VariableNode and return its value."""
-        name = node.token.value
-        if name not in self.variables:
-            raise ValueError(f"Variable '{name}' is not defined")
-        return self.variables[name]
-
-    def visit_AssignmentNode(self, node):
-        """Visit an AssignmentNode and update the variable's value."""
-        name = node.left.token.value
-        value = self.visit(node.right)
-        self.variables[name] = value
-        return value
-
-    def visit_BinaryOpNode(self, node):
-        """Visit a BinaryOpNode and perform the appropriate binary operation."""
-        left = self.visit(node.left)
-        right = self.visit(node.right)
-        op = node.op.type
-        if op == '+':
-            return left + right
-        elif op == '-':
-            return left - right
-        elif op == '*':
-            return left * right
-        elif op == '/':
-            if right == 0:
-                raise ZeroDivisionError("Division by zero")
-            return left / right
-        else:
-            raise ValueError(f"Unknown operator: {op}")
-
-    def visit_PrintNode(self, node):
-        """Visit a PrintNode and print the result of evaluating the expression."""
-        value = self.visit(node.expr)
-        print(value)
-        return value
-
-    def generic_visit(self, node):
-        """
-        Raise an error for unsupported node types.
-
-        Args:
-            node (ASTNode): The node to be visited.
-
-        Raises:
-            TypeError: If no visit method is defined for the given node type.
-        """
-        raise TypeError(f"No visit method defined for {type(node)}")
-
-    def interpret(self, program):
-        """
-        Interpret the given program (list of AST nodes).
-
-        Args:
-            program (list): A list of AST nodes representing the program.
-        """
-        for stmt in program:
-            self.visit(stmt)
-
-# Example usage
-program = """
-x = 10
-y = 20
-z = x + y
-print(z)
-print(z * 2)
-"""
-
-tokens = lexer(program)
-ast = parser(tokens)
-interpreter = Interpreter()
-interpreter.interpret(ast)
-
-# Test case 1: Simple arithmetic operations
-program1 = """
-a = 10
-b = 20
-c = a + b
-print(c)
-"""
-tokens1 = lexer(program1)
-ast1 = parser(tokens1)
-interpreter1 = Interpreter()
-interpreter1.interpret(ast1)
-# Output: 30
-
-# Test case 2: Nested expressions
-program2 = """
-x = 5
-y = 3
-z = (x + y) * 2
-print(z)
-"""
-tokens2 = lexer(program2)
-ast2 = parser(tokens2)
-interpreter2 = Interpreter()
-interpreter2.interpret(ast2)
-# Output: 16
-
-# Test case 3: Division by zero
-program3 = """
-a = 10
-b = 0
-c = a / b
-print(c)
-"""
-tokens3 = lexer(program3)
-ast3 = parser(tokens3)
-interpreter3 = Interpreter()
-try:
-    interpreter3.interpret(ast3)
-except ZeroDivisionError as e:
-    print(e)
-# Output: Division by zero
-
-# Test case 4: Variable not defined
-program4 = """
-x = a + 5
-print(x)
-"""
-tokens4 = lexer(program4)
-ast4 = parser(tokens4)
-interpreter4 = Interpreter()
-try:
-    interpreter4.interpret(ast4)
-except ValueError as e:
-    print(e)
-# Output: Variable 'a' is not defined
-
-# Test case 5: Syntax error
-program5 = """
-x = 10
-y = 20
-z = x + y *
-print(z)
-"""
-tokens5 = lexer(program5)
-try:
-    ast5 = parser(tokens5)
-except ValueError as e:
-    print(e)
+# PYTHON EVALUATOR BY AHMAD SAEED
+# Lexer
+import functools
+import operator
+import re
+import sys
+from array import array
+
+# Definition of token types
+class Token:
+    """
+    Lexical token carrying its type name and payload value.
+
+    A __slots__ class rather than a namedtuple: reading t.type or t.value
+    is a direct slot load instead of a descriptor call that indexes a
+    tuple, and instances carry no per-object __dict__.
+    """
+    __slots__ = ('type', 'value')
+
+    def __init__(self, type, value):
+        self.type = type
+        self.value = value
+
+RESERVED_KEYWORDS = {'print'}
+
+# Token type names, interned once at module load. Interning guarantees a
+# single canonical object per name, so the parser's equality and frozenset
+# membership checks short-circuit on pointer identity instead of scanning
+# characters.
+_NUMBER = sys.intern('NUMBER')
+_IDENTIFIER = sys.intern('IDENTIFIER')
+_ASSIGN = sys.intern('ASSIGN')
+_EOF = sys.intern('EOF')
+
+# Single alternation covering every lexeme class. Scanning happens inside
+# the compiled regex engine (C code) instead of a Python loop over chars;
+# match.lastgroup tells us which branch matched.
+_LEX = re.compile(
+    r"(?P<NUMBER>\d+)"
+    r"|(?P<IDENT>[A-Za-z][A-Za-z0-9]*)"
+    r"|(?P<ASSIGN>=)"
+    r"|(?P<OP>[+\-*/()])"
+)
+
+# Whitespace runs are skipped with one C-level match each instead of being
+# matched, wrapped in a match object and filtered out as throwaway tokens
+# by the main alternation.
+_WS = re.compile(r"\s+")
+
+def lexer(input_str):
+    """
+    Converts an input string into a list of tokens.
+
+    Args:
+        input_str (str): The input string to be tokenized.
+
+    Returns:
+        list: A list of Token objects representing the tokens in the input string.
+    """
+    # Preallocate for the worst case of one token per character (plus the
+    # EOF sentinel), then trim: filling fixed slots avoids every internal
+    # grow-and-copy that append would trigger as the list expands.
+    tokens = [None] * (len(input_str) + 1)
+    n = 0
+    pos = 0
+    end = len(input_str)
+    ws = _WS.match(input_str, pos)
+    if ws:
+        pos = ws.end()
+    while pos < end:
+        m = _LEX.match(input_str, pos)
+        if m is None:
+            # Raise an error for invalid characters
+            raise ValueError(f"Invalid character: {input_str[pos]}")
+        kind = m.lastgroup
+        text = m.group()
+        pos = m.end()
+        if kind == 'NUMBER':
+            tokens[n] = Token(_NUMBER, int(text))
+        elif kind == 'IDENT':
+            if text in RESERVED_KEYWORDS:
+                # If the identifier is a reserved keyword, add it as a token of that type
+                tokens[n] = Token(sys.intern(text), text)
+            else:
+                # Otherwise, add it as an IDENTIFIER token
+                tokens[n] = Token(_IDENTIFIER, text)
+        elif kind == 'ASSIGN':
+            tokens[n] = Token(_ASSIGN, '=')
+        else:  # OP
+            tokens[n] = Token(sys.intern(text), text)
+        n += 1
+        # Skip whitespace characters in bulk
+        ws = _WS.match(input_str, pos)
+        if ws:
+            pos = ws.end()
+    # Sentinel: the parser can always peek at the current token without a
+    # bounds check, since EOF matches no operator class or expected type.
+    tokens[n] = Token(_EOF, '')
+    del tokens[n + 1:]
+    return tokens
+
+# Parser
+class ASTNode:
+    """Base class for Abstract Syntax Tree (AST) nodes."""
+    # Every subclass declares __slots__, so nodes carry no per-instance
+    # __dict__: attribute reads are fixed-offset loads and a large AST
+    # costs a fraction of the memory.
+    __slots__ = ()
+
+class VariableNode(ASTNode):
+    """AST node representing a variable."""
+    # slot is filled in later by resolve_slots.
+    __slots__ = ('token', 'slot')
+
+    def __init__(self, token):
+        self.token = token
+
+class AssignmentNode(ASTNode):
+    """AST node representing an assignment statement."""
+    __slots__ = ('left', 'right')
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+class BinaryOpNode(ASTNode):
+    """AST node representing a binary operation."""
+    # func is the operator callable resolved once at construction, so the
+    # evaluator neither looks the operator up nor branches on it per visit.
+    __slots__ = ('left', 'op', 'right', 'func')
+
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op
+        self.right = right
+        func = _OPS.get(op.type)
+        if func is None:
+            raise ValueError(f"Unknown operator: {op.type}")
+        self.func = func
+
+class PrintNode(ASTNode):
+    """AST node representing a print statement."""
+    __slots__ = ('expr',)
+
+    def __init__(self, expr):
+        self.expr = expr
+
+# Binding power per binary operator. A single precedence-climbing loop keyed
+# on this table replaces the separate expression/term recursion levels,
+# halving the Python calls made per operator.
+_PREC = {'+': 1, '-': 1, '*': 2, '/': 2}
+
+# Binary operators as C-level functions, bound onto each BinaryOpNode when
+# it is built. Division is plain operator.truediv: a zero divisor raises
+# Python's native ZeroDivisionError, so there is no per-divide zero check
+# on the hot path and catch sites behave as before.
+_OPS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+class TokenCursor:
+    """
+    Read-only cursor over a token list.
+
+    Consuming a token just bumps an integer index, so the parser avoids the
+    O(n) element shifting that list.pop(0) performs on every call. The
+    lexer's trailing EOF sentinel guarantees peek() is always in bounds.
+    """
+    def __init__(self, toks):
+        self.toks = toks
+        self.pos = 0
+
+    def peek(self):
+        """Return the current token without consuming it."""
+        return self.toks[self.pos]
+
+    def advance(self):
+        """Consume and return the current token."""
+        token = self.toks[self.pos]
+        self.pos += 1
+        return token
+
+def parser(tokens):
+    """
+    Converts a list of tokens into an Abstract Syntax Tree (AST).
+
+    Args:
+        tokens (list): A list of Token objects.
+
+    Returns:
+        list: A list of AST nodes representing the parsed program.
+    """
+    cur = TokenCursor(tokens)
+    # Hoisted once into locals: the parse loops below then reach the token
+    # stream and precedence table through the fast local/cell path instead
+    # of repeating attribute lookups on every iteration.
+    peek = cur.peek
+    advance = cur.advance
+    prec_of = _PREC.get
+
+    def parse_expr():
+        """Parse an expression."""
+        return parse_binop(1)
+
+    def parse_binop(min_prec):
+        """Parse a chain of binary operators binding at least min_prec."""
+        node = parse_factor()
+        prec = prec_of(peek().type)
+        while prec is not None and prec >= min_prec:
+            op = advance()
+            right = parse_binop(prec + 1)
+            node = BinaryOpNode(node, op, right)
+            prec = prec_of(peek().type)
+        return node
+
+    def parse_factor():
+        """Parse a factor."""
+        token = advance()
+        if token.type == 'EOF':
+            raise ValueError("Unexpected end of input")
+        if token.type == 'NUMBER':
+            # Literals are returned as plain numbers rather than wrapped in
+            # a node object; every consumer checks for them before class
+            # dispatch, so literal-heavy programs allocate no AST nodes.
+            return token.value
+        elif token.type == 'IDENTIFIER':
+            return VariableNode(token)
+        elif token.type == '(':
+            node = parse_expr()
+            if peek().type != ')':
+                raise ValueError("Expected ')'")
+            advance()
+            return node
+        elif token.type == 'print':
+            expr = parse_expr()
+            return PrintNode(expr)
+        else:
+            raise ValueError(f"Unexpected token: {token.type}")
+
+    def parse_assignment():
+        """Parse an assignment statement."""
+        left = parse_factor()
+        if peek().type != 'ASSIGN':
+            return left
+        if not isinstance(left, VariableNode):
+            # With literals unboxed, a numeric target would otherwise only
+            # fail much later with an AttributeError in the evaluator.
+            raise ValueError("Cannot assign to literal")
+        advance()
+        right = parse_expr()
+        return AssignmentNode(left, right)
+
+    ast = []
+    while peek().type != 'EOF':
+        ast.append(parse_assignment())
+    return ast
+
+# Constant folding
+def fold_constants(program):
+    """
+    Collapse constant arithmetic subtrees in a parsed program.
+
+    Any BinaryOpNode whose children are (after folding) plain numbers is
+    evaluated once here, bottom-up, and replaced with its numeric result,
+    so the evaluator loads a precomputed value instead of redoing the
+    same arithmetic on every run.
+
+    Args:
+        program (list): A list of AST nodes representing the program.
+
+    Returns:
+        list: The program with constant subtrees folded in place.
+    """
+    def fold(node):
+        if isinstance(node, BinaryOpNode):
+            node.left = fold(node.left)
+            node.right = fold(node.right)
+            left = node.left
+            right = node.right
+            if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+                # The node already carries its operator callable; a literal
+                # zero divisor is the one case left unfolded so the error
+                # still surfaces at run time, as before.
+                if node.op.type != '/' or right != 0:
+                    return node.func(left, right)
+        elif isinstance(node, AssignmentNode):
+            node.right = fold(node.right)
+        elif isinstance(node, PrintNode):
+            node.expr = fold(node.expr)
+        return node
+
+    return [fold(stmt) for stmt in program]
+
+# Symbol resolution
+_UNDEFINED = object()  # marks a variable slot that has not been assigned yet
+
+def resolve_slots(program, slot_index=None):
+    """
+    Assign every distinct variable in a program a dense integer slot.
+
+    Rewrites each VariableNode in place to carry a slot index, letting the
+    evaluator read and write variables by list index instead of hashing a
+    name string on every access. The pass is idempotent, so re-resolving
+    an already-interpreted AST yields the same slots.
+
+    Args:
+        program (list): A list of AST nodes representing the program.
+        slot_index (dict): Optional existing name-to-slot mapping to
+            extend; an interpreter passes its own so each name keeps one
+            stable slot across every program it runs.
+
+    Returns:
+        int: The number of distinct variables in slot_index.
+    """
+    if slot_index is None:
+        slot_index = {}
+
+    def resolve(node):
+        if isinstance(node, VariableNode):
+            name = node.token.value
+            slot = slot_index.get(name)
+            if slot is None:
+                slot = slot_index[name] = len(slot_index)
+            node.slot = slot
+        elif isinstance(node, AssignmentNode):
+            resolve(node.left)
+            resolve(node.right)
+        elif isinstance(node, BinaryOpNode):
+            resolve(node.left)
+            resolve(node.right)
+        elif isinstance(node, PrintNode):
+            resolve(node.expr)
+
+    for stmt in program:
+        resolve(stmt)
+    return len(slot_index)
+
+# Evaluator
+class Interpreter:
+    """
+    Interpreter for the programming language.
+    """
+    def __init__(self):
+        # Variable storage: a flat list indexed by the slot numbers that
+        # resolve_slots assigns against this interpreter's own name-to-slot
+        # mapping, so values persist across interpret() calls just as the
+        # old variables dict did.
+        self.slots = []
+        self._slot_index = {}
+        # Dispatch table keyed by node class, built once. Looking up the
+        # bound method here avoids constructing 'visit_<ClassName>' and
+        # calling getattr on every single node visit.
+        self._dispatch = {
+            VariableNode: self.visit_VariableNode,
+            AssignmentNode: self.visit_AssignmentNode,
+            BinaryOpNode: self.visit_BinaryOpNode,
+            PrintNode: self.visit_PrintNode,
+        }
+
+    def visit(self, node):
+        """
+        Dispatches the visit to the appropriate visitor method based on the type of the node.
+
+        Args:
+            node (ASTNode | int | float): The node to be visited.
+
+        Returns:
+            The result of visiting the node.
+        """
+        if isinstance(node, (int, float)):
+            # Numeric literals are stored unboxed in the tree.
+            return node
+        return self._dispatch.get(type(node), self.generic_visit)(node)
+
+    def visit_VariableNode(self, node):
+        """Visit a VariableNode and return its value."""
+        value = self.slots[node.slot]
+        if value is _UNDEFINED:
+            raise ValueError(f"Variable '{node.token.value}' is not defined")
+        return value
+
+    def visit_AssignmentNode(self, node):
+        """Visit an AssignmentNode and update the variable's value."""
+        value = self.visit(node.right)
+        self.slots[node.left.slot] = value
+        return value
+
+    def visit_BinaryOpNode(self, node):
+        """Visit a BinaryOpNode and apply its preselected operator."""
+        return node.func(self.visit(node.left), self.visit(node.right))
+
+    def visit_PrintNode(self, node):
+        """Visit a PrintNode and print the result of evaluating the expression."""
+        value = self.visit(node.expr)
+        print(value)
+        return value
+
+    def generic_visit(self, node):
+        """
+        Raise an error for unsupported node types.
+
+        Args:
+            node (ASTNode): The node to be visited.
+
+        Raises:
+            TypeError: If no visit method is defined for the given node type.
+        """
+        raise TypeError(f"No visit method defined for {type(node)}")
+
+    def interpret(self, program):
+        """
+        Interpret the given program (list of AST nodes).
+
+        Args:
+            program (list): A list of AST nodes representing the program.
+        """
+        count = resolve_slots(program, self._slot_index)
+        if count > len(self.slots):
+            self.slots.extend([_UNDEFINED] * (count - len(self.slots)))
+        for stmt in program:
+            self.visit(stmt)
+
+# Bytecode compiler
+# Repeatedly interpreting the same AST pays visitor dispatch (string build,
+# getattr, method call) on every node, every run. compile_ast lowers the tree
+# once to a flat stack-machine bytecode; run_bytecode then evaluates it in a
+# single loop that switches on small integer opcodes.
+
+# Opcodes. LOAD_CONST/LOAD_VAR/STORE_VAR take the following int as operand;
+# the rest are operand-free.
+LOAD_CONST, LOAD_VAR, STORE_VAR, ADD, SUB, MUL, DIV, PRINT, POP = range(9)
+
+_OPCODE_FOR = {'+': ADD, '-': SUB, '*': MUL, '/': DIV}
+
+def compile_ast(program):
+    """
+    Lower a parsed program to flat stack-machine bytecode.
+
+    Args:
+        program (list): A list of AST nodes representing the program.
+
+    Returns:
+        tuple: (code, consts, names) where code is a flat list of ints,
+        consts is the constant pool and names maps variable slots to names.
+    """
+    code = []
+    consts = []
+    const_index = {}
+    names = []
+    name_index = {}
+
+    def const_slot(value):
+        # Keyed by (type, value): 2 and 2.0 compare and hash equal, so a
+        # raw-value key would silently merge an int and a float constant
+        # into one slot. CPython's own compiler keys its pool the same way.
+        key = (type(value), value)
+        slot = const_index.get(key)
+        if slot is None:
+            slot = const_index[key] = len(consts)
+            consts.append(value)
+        return slot
+
+    def name_slot(name):
+        slot = name_index.get(name)
+        if slot is None:
+            slot = name_index[name] = len(names)
+            names.append(name)
+        return slot
+
+    def emit_expr(node):
+        if isinstance(node, (int, float)):
+            code.append(LOAD_CONST)
+            code.append(const_slot(node))
+        elif isinstance(node, VariableNode):
+            code.append(LOAD_VAR)
+            code.append(name_slot(node.token.value))
+        elif isinstance(node, BinaryOpNode):
+            emit_expr(node.left)
+            emit_expr(node.right)
+            code.append(_OPCODE_FOR[node.op.type])
+        elif isinstance(node, PrintNode):
+            emit_expr(node.expr)
+            code.append(PRINT)
+        else:
+            raise TypeError(f"Cannot compile {type(node)}")
+
+    for stmt in program:
+        if isinstance(stmt, AssignmentNode):
+            emit_expr(stmt.right)
+            code.append(STORE_VAR)
+            code.append(name_slot(stmt.left.token.value))
+        else:
+            emit_expr(stmt)
+            code.append(POP)
+    return code, consts, names
+
+def run_bytecode(code, consts, names):
+    """
+    Evaluate compiled bytecode on a simple value stack.
+
+    Args:
+        code (list): Flat opcode/operand list produced by compile_ast.
+        consts (list): Constant pool.
+        names (list): Variable names indexed by slot.
+    """
+    undefined = object()
+    slots = [undefined] * len(names)
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    pc = 0
+    end = len(code)
+    while pc < end:
+        op = code[pc]
+        pc += 1
+        if op == LOAD_CONST:
+            push(consts[code[pc]])
+            pc += 1
+        elif op == LOAD_VAR:
+            value = slots[code[pc]]
+            if value is undefined:
+                raise ValueError(f"Variable '{names[code[pc]]}' is not defined")
+            push(value)
+            pc += 1
+        elif op == STORE_VAR:
+            slots[code[pc]] = pop()
+            pc += 1
+        elif op == ADD:
+            right = pop()
+            push(pop() + right)
+        elif op == SUB:
+            right = pop()
+            push(pop() - right)
+        elif op == MUL:
+            right = pop()
+            push(pop() * right)
+        elif op == DIV:
+            right = pop()
+            push(pop() / right)
+        elif op == PRINT:
+            # Prints the top of stack but leaves it there, mirroring
+            # visit_PrintNode returning the value; the statement-level
+            # POP discards it.
+            print(stack[-1])
+        else:  # POP
+            pop()
+
+# Struct-of-arrays AST
+# A class-per-node tree stores every node as a separate heap object and
+# traversal chases pointers. flatten_ast re-encodes a parsed program as
+# parallel arrays indexed by node id: a bytearray of tags plus typed int
+# arrays for child links, so evaluation walks dense arrays instead.
+
+# Flat-node tags, one per bytearray slot.
+T_NUMBER, T_VARIABLE, T_ASSIGN, T_ADD, T_SUB, T_MUL, T_DIV, T_PRINT = range(8)
+
+_TAG_FOR_OP = {'+': T_ADD, '-': T_SUB, '*': T_MUL, '/': T_DIV}
+
+def flatten_ast(program):
+    """
+    Re-encode a parsed program as parallel flat arrays.
+
+    Args:
+        program (list): A list of AST nodes representing the program.
+
+    Returns:
+        tuple: (tags, lhs, rhs, values, roots). tags is a bytearray of
+        node tags; lhs/rhs are array('i') child node ids; values holds
+        per-node payloads (numbers and variable names); roots lists the
+        node id of each top-level statement.
+    """
+    tags = bytearray()
+    lhs = array('i')
+    rhs = array('i')
+    values = []
+
+    def add(tag, a=-1, b=-1, value=None):
+        node_id = len(tags)
+        tags.append(tag)
+        lhs.append(a)
+        rhs.append(b)
+        values.append(value)
+        return node_id
+
+    def flatten(node):
+        if isinstance(node, (int, float)):
+            return add(T_NUMBER, value=node)
+        elif isinstance(node, VariableNode):
+            return add(T_VARIABLE, value=node.token.value)
+        elif isinstance(node, AssignmentNode):
+            return add(T_ASSIGN, flatten(node.right), value=node.left.token.value)
+        elif isinstance(node, BinaryOpNode):
+            return add(_TAG_FOR_OP[node.op.type], flatten(node.left), flatten(node.right))
+        elif isinstance(node, PrintNode):
+            return add(T_PRINT, flatten(node.expr))
+        else:
+            raise TypeError(f"Cannot flatten {type(node)}")
+
+    roots = [flatten(stmt) for stmt in program]
+    return tags, lhs, rhs, values, roots
+
+def eval_flat(tags, lhs, rhs, values, roots):
+    """
+    Evaluate a program flattened by flatten_ast.
+
+    Args:
+        tags, lhs, rhs, values, roots: The arrays returned by flatten_ast.
+    """
+    variables = {}
+
+    def eval_node(i):
+        tag = tags[i]
+        if tag == T_NUMBER:
+            return values[i]
+        elif tag == T_VARIABLE:
+            name = values[i]
+            if name not in variables:
+                raise ValueError(f"Variable '{name}' is not defined")
+            return variables[name]
+        elif tag == T_ASSIGN:
+            value = eval_node(lhs[i])
+            variables[values[i]] = value
+            return value
+        elif tag == T_PRINT:
+            value = eval_node(lhs[i])
+            print(value)
+            return value
+        left = eval_node(lhs[i])
+        right = eval_node(rhs[i])
+        if tag == T_ADD:
+            return left + right
+        elif tag == T_SUB:
+            return left - right
+        elif tag == T_MUL:
+            return left * right
+        else:  # T_DIV
+            return left / right
+
+    for root in roots:
+        eval_node(root)
+
+# Runtime code generation
+# The furthest specialization available without leaving the standard
+# library: translate the AST once into straight-line Python source, compile()
+# it, and let CPython's native bytecode run it. Repeated runs pay no node
+# objects, no visitor dispatch and no operator lookups at all.
+
+def _codegen_print(value):
+    """print() wrapper for generated code; returns the printed value so a
+    print can appear inside an expression, matching visit_PrintNode."""
+    print(value)
+    return value
+
+def codegen(program):
+    """
+    Compile a parsed program into a Python function.
+
+    Variables become function locals, arithmetic becomes native Python
+    expressions and print statements become calls, so every run after the
+    one-time compile executes at plain-CPython speed. Variable names are
+    mangled with a 'v_' prefix so toy-language names that happen to be
+    Python keywords (e.g. 'if' or 'None') still compile. Runtime errors
+    surface as Python's own exceptions (NameError for an undefined
+    variable, ZeroDivisionError for division by zero).
+
+    Args:
+        program (list): A list of AST nodes representing the program.
+
+    Returns:
+        callable: A zero-argument function that runs the program.
+    """
+    def gen_expr(node):
+        if isinstance(node, (int, float)):
+            return repr(node)
+        elif isinstance(node, VariableNode):
+            return 'v_' + node.token.value
+        elif isinstance(node, BinaryOpNode):
+            return f"({gen_expr(node.left)} {node.op.type} {gen_expr(node.right)})"
+        elif isinstance(node, PrintNode):
+            return f"_print({gen_expr(node.expr)})"
+        else:
+            raise TypeError(f"Cannot generate code for {type(node)}")
+
+    lines = ['def _run():']
+    for stmt in program:
+        if isinstance(stmt, AssignmentNode):
+            lines.append(f"    v_{stmt.left.token.value} = {gen_expr(stmt.right)}")
+        else:
+            lines.append(f"    {gen_expr(stmt)}")
+    if not program:
+        lines.append('    pass')
+    namespace = {'_print': _codegen_print}
+    exec(compile('\n'.join(lines), '<codegen>', 'exec'), namespace)
+    return namespace['_run']
+
+# Cached front end
+@functools.lru_cache(maxsize=128)
+def _lex_parse(input_str):
+    """
+    Tokenize, parse and constant-fold a source string, memoized by text.
+
+    Re-running the same source skips the lexer and parser entirely and
+    reuses the cached token stream and AST. Tokens are returned as an
+    immutable tuple so cached streams can be parsed again safely.
+
+    Args:
+        input_str (str): The source text.
+
+    Returns:
+        tuple: (tokens, ast) — the token tuple and the folded AST list.
+    """
+    tokens = tuple(lexer(input_str))
+    return tokens, fold_constants(parser(tokens))
+
+# Example usage
+program = """
+x = 10
+y = 20
+z = x + y
+print(z)
+print(z * 2)
+"""
+
+tokens, ast = _lex_parse(program)
+interpreter = Interpreter()
+interpreter.interpret(ast)
+
+# Test case 1: Simple arithmetic operations
+program1 = """
+a = 10
+b = 20
+c = a + b
+print(c)
+"""
+tokens1, ast1 = _lex_parse(program1)
+interpreter1 = Interpreter()
+interpreter1.interpret(ast1)
+# Output: 30
+
+# Test case 2: Nested expressions
+program2 = """
+x = 5
+y = 3
+z = (x + y) * 2
+print(z)
+"""
+tokens2, ast2 = _lex_parse(program2)
+interpreter2 = Interpreter()
+interpreter2.interpret(ast2)
+# Output: 16
+
+# Test case 3: Division by zero
+program3 = """
+a = 10
+b = 0
+c = a / b
+print(c)
+"""
+tokens3, ast3 = _lex_parse(program3)
+interpreter3 = Interpreter()
+try:
+    interpreter3.interpret(ast3)
+except ZeroDivisionError as e:
+    print(e)
+# Output: division by zero
+
+# Test case 4: Variable not defined
+program4 = """
+x = a + 5
+print(x)
+"""
+tokens4, ast4 = _lex_parse(program4)
+interpreter4 = Interpreter()
+try:
+    interpreter4.interpret(ast4)
+except ValueError as e:
+    print(e)
+# Output: Variable 'a' is not defined
+
+# Test case 5: Syntax error
+program5 = """
+x = 10
+y = 20
+z = x + y *
+print(z)
+"""
+try:
+    tokens5, ast5 = _lex_parse(program5)
+except ValueError as e:
+    print(e)
 # Output: Unexpected token: ')'
\ No newline at end of file